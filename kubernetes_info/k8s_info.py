@@ -9,55 +9,129 @@ requirements: kubernetes
 
 from kubernetes import client, config
 from collections import defaultdict
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from operator import attrgetter
 import json
-
-KNOWN_CRDS = {
-    "argocd_applications": {
-        "group": "argoproj.io",
-        "version": "v1alpha1",
-        "plural": "applications",
-        "summarizer": lambda items: summarize_argocd_applications(items)
-    },
-    "certmanager_certificates": {
-        "group": "cert-manager.io",
-        "version": "v1",
-        "plural": "certificates",
-        "summarizer": lambda items: summarize_certmanager_certificates(items)
-    }
+import sys
+import threading
+import time
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Page size and per-request timeout (seconds) for list calls against the apiserver
+LIST_PAGE_SIZE = 500
+REQUEST_TIMEOUT = 30
+CONNECTION_POOL_MAXSIZE = 50
+
+# How long (seconds) list results are reused before hitting the apiserver again
+CACHE_TTL = {
+    "deployments": 30,
+    "pods": 10,
+    "services": 30,
 }
 
+# Certificates expiring within this many days are reported by the summarizer
+EXPIRY_WARNING_DAYS = 7
+
+# --- Timestamp parsing ---
+# Prefer the ciso8601 C parser when installed; Python 3.11+ fromisoformat
+# accepts the trailing "Z" itself, older versions need it rewritten.
+try:
+    from ciso8601 import parse_datetime as _parse_timestamp
+except ImportError:
+    if sys.version_info >= (3, 11):
+        _parse_timestamp = datetime.fromisoformat
+    else:
+        def _parse_timestamp(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# --- Container images ---
+_image = attrgetter("image")
+_restart_count = attrgetter("restart_count")
+
+def _container_images(containers) -> list:
+    # The same image strings repeat across every pod of a deployment; interning
+    # lets all records share one copy and makes set lookups hit on identity
+    return [
+        sys.intern(image) if image else image for image in map(_image, containers or ())
+    ]
+
+# --- Cache ---
+class _Cache:
+    """Thread-safe TTL cache of list results keyed by (kind, namespace)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, ttl, load):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        try:
+            value = load()
+        except Exception:
+            # Never keep serving an entry whose refresh just failed
+            self.invalidate(key)
+            raise
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+_list_cache = _Cache()
+
 # --- Summarizers ---
 def summarize_argocd_applications(items) -> str:
-    total = len(items)
-    synced = sum(1 for app in items if app.get("status", {}).get("sync", {}).get("status") == "Synced")
-    healthy = sum(1 for app in items if app.get("status", {}).get("health", {}).get("status") == "Healthy")
-
-    details = [
-        f"{app.get('metadata', {}).get('name', '<unknown>')} "
-        f"({app.get('metadata', {}).get('namespace', '<unknown>')}) — "
-        f"Sync: {app.get('status', {}).get('sync', {}).get('status', 'Unknown')}, "
-        f"Health: {app.get('status', {}).get('health', {}).get('status', 'Unknown')}"
-        for app in items
-    ]
+    total = synced = healthy = 0
+    details = []
+
+    for app in items:
+        meta = app.get("metadata") or {}
+        status = app.get("status") or {}
+        sync_status = (status.get("sync") or {}).get("status", "Unknown")
+        health_status = (status.get("health") or {}).get("status", "Unknown")
+
+        total += 1
+        synced += sync_status == "Synced"
+        healthy += health_status == "Healthy"
+        details.append(
+            f"{meta.get('name', '<unknown>')} ({meta.get('namespace', '<unknown>')}) — "
+            f"Sync: {sync_status}, Health: {health_status}"
+        )
 
-    return (
+    return "\n".join([
         f"📦 ArgoCD Applications: {total} total — {synced} synced, {total-synced} out-of-sync, "
-        f"{healthy} healthy, {total-healthy} degraded.\nDetails:\n" + "\n".join(details)
-    )
+        f"{healthy} healthy, {total-healthy} degraded.",
+        "Details:",
+        *details,
+    ])
 
 def summarize_certmanager_certificates(items) -> str:
     total = len(items)
     expiring_soon = []
     now = datetime.now(timezone.utc)
+    cutoff = now + timedelta(days=EXPIRY_WARNING_DAYS)
 
     for cert in items:
         expiry_str = cert.get("status", {}).get("notAfter")
         if expiry_str:
             try:
-                expiry = datetime.fromisoformat(expiry_str.replace("Z", "+00:00"))
-                days_left = (expiry - now).days
-                if days_left < 7:
+                expiry = _parse_timestamp(expiry_str)
+                if expiry < cutoff:
+                    # Only reported certs need the timedelta for the message
+                    days_left = (expiry - now).days
                     expiring_soon.append(
                         f"{cert.get('metadata', {}).get('name', '<unknown>')} "
                         f"({cert.get('metadata', {}).get('namespace', '<unknown>')}) — "
@@ -66,11 +140,30 @@ def summarize_certmanager_certificates(items) -> str:
             except ValueError:
                 pass
 
-    details = "\n".join(expiring_soon) if expiring_soon else "No certificates expiring within 7 days."
-    return (
-        f"🔐 Cert-Manager Certificates: {total} total.\n"
-        f"Expiring soon (<7 days): {len(expiring_soon)}\n{details}"
-    )
+    return "\n".join([
+        f"🔐 Cert-Manager Certificates: {total} total.",
+        f"Expiring soon (<{EXPIRY_WARNING_DAYS} days): {len(expiring_soon)}",
+        *(expiring_soon or [f"No certificates expiring within {EXPIRY_WARNING_DAYS} days."]),
+    ])
+
+# --- Known CRDs ---
+KNOWN_CRDS = {
+    "argocd_applications": {
+        "group": "argoproj.io",
+        "version": "v1alpha1",
+        "plural": "applications",
+        "summarizer": summarize_argocd_applications
+    },
+    "certmanager_certificates": {
+        "group": "cert-manager.io",
+        "version": "v1",
+        "plural": "certificates",
+        "summarizer": summarize_certmanager_certificates
+    }
+}
+
+# Known CRDs keyed by lower-cased (group, plural) for case-insensitive lookup
+_CRD_BY_GP = {(v["group"].lower(), v["plural"].lower()): v for v in KNOWN_CRDS.values()}
 
 class Tools:
     def __init__(self):
@@ -80,9 +173,182 @@ class Tools:
         except:
             config.load_incluster_config()
 
-        self.v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.custom_api = client.CustomObjectsApi()
+        # Share one ApiClient (and its urllib3 pool) across all APIs so
+        # concurrent calls reuse keep-alive connections instead of new TLS handshakes
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+        configuration.retries = Retry(total=3, backoff_factor=0.2)
+        # Responses stay JSON: the Python client has no protobuf decoder, so
+        # advertising application/vnd.kubernetes.protobuf would break deserialization
+        self._api_client = client.ApiClient(configuration)
+
+        self.v1 = client.CoreV1Api(self._api_client)
+
+    # Only some tools need these; create them on first use
+    @cached_property
+    def apps_v1(self):
+        return client.AppsV1Api(self._api_client)
+
+    @cached_property
+    def custom_api(self):
+        return client.CustomObjectsApi(self._api_client)
+
+    @staticmethod
+    def _list(list_fn, watch_cache: bool = True, **kwargs):
+        # These are read-only snapshots for summarisation, so seconds-old data is
+        # fine: let the apiserver answer from its watch cache (resourceVersion=0)
+        # instead of doing a quorum read from etcd.
+        if watch_cache:
+            kwargs.setdefault("resource_version", "0")
+            kwargs.setdefault("resource_version_match", "NotOlderThan")
+        kwargs.setdefault("_request_timeout", REQUEST_TIMEOUT)
+        return list_fn(**kwargs)
+
+    def _paged_items(self, list_fn, **kwargs):
+        # Fetch in chunks of LIST_PAGE_SIZE; continue tokens carry the snapshot
+        # for later pages and must not be combined with a resourceVersion.
+        kwargs["limit"] = LIST_PAGE_SIZE
+        page = self._list(list_fn, **kwargs)
+        yield from page.items
+        while page.metadata._continue:
+            page = self._list(
+                list_fn, watch_cache=False, _continue=page.metadata._continue, **kwargs
+            )
+            yield from page.items
+
+    def _list_by_namespace(self, list_namespaced, list_all, namespace: str = None) -> dict:
+        # One cluster-wide list call grouped client-side replaces a
+        # list_namespace() call plus one list call per namespace.
+        if namespace:
+            return {namespace: list(self._paged_items(list_namespaced, namespace=namespace))}
+        groups = defaultdict(list)
+        for item in self._paged_items(list_all):
+            groups[item.metadata.namespace].append(item)
+        return groups
+
+    def _cached_list(self, kind, list_namespaced, list_all, namespace: str = None) -> dict:
+        return _list_cache.get_or_load(
+            (kind, namespace),
+            CACHE_TTL[kind],
+            lambda: self._list_by_namespace(list_namespaced, list_all, namespace),
+        )
+
+    def _list_deployments(self, namespace: str = None) -> dict:
+        return self._cached_list(
+            "deployments",
+            self.apps_v1.list_namespaced_deployment,
+            self.apps_v1.list_deployment_for_all_namespaces,
+            namespace,
+        )
+
+    def _list_pods(self, namespace: str = None) -> dict:
+        return self._cached_list(
+            "pods",
+            self.v1.list_namespaced_pod,
+            self.v1.list_pod_for_all_namespaces,
+            namespace,
+        )
+
+    def _list_services(self, namespace: str = None) -> dict:
+        return self._cached_list(
+            "services",
+            self.v1.list_namespaced_service,
+            self.v1.list_service_for_all_namespaces,
+            namespace,
+        )
+
+    @staticmethod
+    def _deployment_record(dep) -> dict:
+        return {
+            "name": dep.metadata.name,
+            "replicas": dep.spec.replicas,
+            "available_replicas": dep.status.available_replicas or 0,
+            "images": _container_images(dep.spec.template.spec.containers),
+        }
+
+    @staticmethod
+    def _pod_record(pod) -> dict:
+        return {
+            "name": pod.metadata.name,
+            "phase": pod.status.phase,
+            "host_ip": pod.status.host_ip,
+            "pod_ip": pod.status.pod_ip,
+            "restart_count": sum(map(_restart_count, pod.status.container_statuses or ())),
+            "images": _container_images(pod.spec.containers),
+        }
+
+    @staticmethod
+    def _service_record(svc) -> dict:
+        return {
+            "name": svc.metadata.name,
+            "type": svc.spec.type,
+            "cluster_ip": svc.spec.cluster_ip,
+            "ports": [
+                {"port": p.port, "targetPort": p.target_port}
+                for p in (svc.spec.ports or [])
+            ],
+        }
+
+    def _collect_ns_info(self, deployments, pods, services) -> dict:
+        ns_info = {
+            "deployments": [self._deployment_record(dep) for dep in deployments],
+            "pods": [],
+            "services": [self._service_record(svc) for svc in services],
+            "version_issues": [],
+        }
+
+        # Pods — remember each deployment's first pod images and only build an
+        # image set once a pod with different images shows up
+        first_images = {}
+        mismatched = {}
+
+        for pod in pods:
+            pod_info = self._pod_record(pod)
+            owner = next(
+                (
+                    o for o in (pod.metadata.owner_references or ())
+                    if o.kind == "ReplicaSet" and "-" in o.name
+                ),
+                None,
+            )
+            deployment_name = owner.name.rpartition("-")[0] if owner else None
+
+            if deployment_name:
+                pod_images = pod_info["images"]
+                seen = first_images.setdefault(deployment_name, pod_images)
+                if pod_images != seen:
+                    mismatched.setdefault(deployment_name, set(seen)).update(pod_images)
+
+            ns_info["pods"].append(pod_info)
+
+        # Version mismatch detection
+        for dep_name, images in mismatched.items():
+            ns_info["version_issues"].append(
+                {
+                    "deployment": dep_name,
+                    "detected_images": list(images),
+                    "issue": "Mismatched versions detected in pods — rollout may be incomplete or stuck.",
+                }
+            )
+
+        return ns_info
+
+    def _list_custom_objects(self, group, version, plural, namespace: str = None) -> dict:
+        # Custom object lists can be megabytes of JSON; take the raw body and
+        # decode it with orjson when available instead of the client's json path
+        if namespace:
+            resp = self._list(
+                self.custom_api.list_namespaced_custom_object,
+                group=group, version=version, namespace=namespace, plural=plural,
+                _preload_content=False,
+            )
+        else:
+            resp = self._list(
+                self.custom_api.list_cluster_custom_object,
+                group=group, version=version, plural=plural,
+                _preload_content=False,
+            )
+        return _json_loads(resp.data)
 
     def get_k8s_cluster_info(self, namespace: str = None) -> dict:
         """
@@ -91,98 +357,30 @@ class Tools:
         Also returns a plain-English summary.
         Use when you want a complete cluster-wide or namespace-specific overview.
         """
-        namespaces = (
-            [namespace]
-            if namespace
-            else [ns.metadata.name for ns in self.v1.list_namespace().items]
-        )
-        cluster_info = {}
-        summaries = []
-
-        for ns in namespaces:
-            ns_info = {
-                "deployments": [],
-                "pods": [],
-                "services": [],
-                "version_issues": [],
-            }
-
-            # Deployments
-            deployments = self.apps_v1.list_namespaced_deployment(namespace=ns)
-            for dep in deployments.items:
-                containers = dep.spec.template.spec.containers or []
-                dep_images = [c.image for c in containers]
-                ns_info["deployments"].append(
-                    {
-                        "name": dep.metadata.name,
-                        "replicas": dep.spec.replicas,
-                        "available_replicas": dep.status.available_replicas or 0,
-                        "images": dep_images,
-                    }
+        try:
+            # The three list calls are network-bound, so issue them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                deployments = executor.submit(self._list_deployments, namespace)
+                pods = executor.submit(self._list_pods, namespace)
+                services = executor.submit(self._list_services, namespace)
+                deployments, pods, services = (
+                    deployments.result(), pods.result(), services.result()
                 )
+        except Exception as e:
+            return {"error": str(e)}
 
-            # Pods
-            pods = self.v1.list_namespaced_pod(namespace=ns)
-            deployment_image_map = defaultdict(set)
-
-            for pod in pods.items:
-                containers = pod.spec.containers or []
-                pod_images = [c.image for c in containers]
-                owner_refs = pod.metadata.owner_references or []
-                deployment_name = None
-                for owner in owner_refs:
-                    if owner.kind == "ReplicaSet" and "-" in owner.name:
-                        deployment_name = "-".join(owner.name.split("-")[:-1])
-                        break
-
-                if deployment_name:
-                    deployment_image_map[deployment_name].update(pod_images)
-
-                container_statuses = pod.status.container_statuses or []
-                ns_info["pods"].append(
-                    {
-                        "name": pod.metadata.name,
-                        "phase": pod.status.phase,
-                        "host_ip": pod.status.host_ip,
-                        "pod_ip": pod.status.pod_ip,
-                        "restart_count": sum(
-                            cs.restart_count for cs in container_statuses
-                        ),
-                        "images": pod_images,
-                    }
-                )
+        cluster_info = {}
+        summaries = []
 
-            # Version mismatch detection
-            for dep_name, images in deployment_image_map.items():
-                if len(images) > 1:
-                    mismatch_msg = (
-                        f"Namespace '{ns}': Deployment '{dep_name}' has version mismatch — "
-                        f"running images: {', '.join(images)}"
-                    )
-                    ns_info["version_issues"].append(
-                        {
-                            "deployment": dep_name,
-                            "detected_images": list(images),
-                            "issue": "Mismatched versions detected in pods — rollout may be incomplete or stuck.",
-                        }
-                    )
-                    summaries.append(mismatch_msg)
-
-            # Services
-            services = self.v1.list_namespaced_service(namespace=ns)
-            for svc in services.items:
-                ports = svc.spec.ports or []
-                ns_info["services"].append(
-                    {
-                        "name": svc.metadata.name,
-                        "type": svc.spec.type,
-                        "cluster_ip": svc.spec.cluster_ip,
-                        "ports": [
-                            {"port": p.port, "targetPort": p.target_port} for p in ports
-                        ],
-                    }
+        for ns in sorted(set(deployments) | set(pods) | set(services)):
+            ns_info = self._collect_ns_info(
+                deployments.get(ns, []), pods.get(ns, []), services.get(ns, [])
+            )
+            for issue in ns_info["version_issues"]:
+                summaries.append(
+                    f"Namespace '{ns}': Deployment '{issue['deployment']}' has version mismatch — "
+                    f"running images: {', '.join(issue['detected_images'])}"
                 )
-
             cluster_info[ns] = ns_info
 
         if not summaries:
@@ -197,81 +395,42 @@ class Tools:
         Retrieve a list of deployments with replica counts and container images.
         Use this when you only need deployment info without pods or services.
         """
-        namespaces = (
-            [namespace]
-            if namespace
-            else [ns.metadata.name for ns in self.v1.list_namespace().items]
-        )
-        results = {}
-        for ns in namespaces:
-            deployments = self.apps_v1.list_namespaced_deployment(namespace=ns)
-            results[ns] = [
-                {
-                    "name": dep.metadata.name,
-                    "replicas": dep.spec.replicas,
-                    "available_replicas": dep.status.available_replicas or 0,
-                    "images": [
-                        c.image for c in (dep.spec.template.spec.containers or [])
-                    ],
-                }
-                for dep in deployments.items
-            ]
-        return results
+        try:
+            grouped = self._list_deployments(namespace)
+        except Exception as e:
+            return {"error": str(e)}
+        return {
+            ns: [self._deployment_record(dep) for dep in items]
+            for ns, items in grouped.items()
+        }
 
     def get_pods(self, namespace: str = None) -> dict:
         """
         Retrieve pod names, status, restart counts, and container images.
         Use this for pod-level debugging without fetching deployments/services.
         """
-        namespaces = (
-            [namespace]
-            if namespace
-            else [ns.metadata.name for ns in self.v1.list_namespace().items]
-        )
-        results = {}
-        for ns in namespaces:
-            pods = self.v1.list_namespaced_pod(namespace=ns)
-            results[ns] = [
-                {
-                    "name": pod.metadata.name,
-                    "phase": pod.status.phase,
-                    "host_ip": pod.status.host_ip,
-                    "pod_ip": pod.status.pod_ip,
-                    "restart_count": sum(
-                        cs.restart_count for cs in (pod.status.container_statuses or [])
-                    ),
-                    "images": [c.image for c in (pod.spec.containers or [])],
-                }
-                for pod in pods.items
-            ]
-        return results
+        try:
+            grouped = self._list_pods(namespace)
+        except Exception as e:
+            return {"error": str(e)}
+        return {
+            ns: [self._pod_record(pod) for pod in items]
+            for ns, items in grouped.items()
+        }
 
     def get_services(self, namespace: str = None) -> dict:
         """
         Retrieve services with type, cluster IP, and ports.
         Use this for networking/service discovery checks without deployments/pods.
         """
-        namespaces = (
-            [namespace]
-            if namespace
-            else [ns.metadata.name for ns in self.v1.list_namespace().items]
-        )
-        results = {}
-        for ns in namespaces:
-            services = self.v1.list_namespaced_service(namespace=ns)
-            results[ns] = [
-                {
-                    "name": svc.metadata.name,
-                    "type": svc.spec.type,
-                    "cluster_ip": svc.spec.cluster_ip,
-                    "ports": [
-                        {"port": p.port, "targetPort": p.target_port}
-                        for p in (svc.spec.ports or [])
-                    ],
-                }
-                for svc in services.items
-            ]
-        return results
+        try:
+            grouped = self._list_services(namespace)
+        except Exception as e:
+            return {"error": str(e)}
+        return {
+            ns: [self._service_record(svc) for svc in items]
+            for ns, items in grouped.items()
+        }
 
     def get_custom_objects(self, group: str, version: str = None, plural: str = None, namespace: str = None) -> dict:
         """
@@ -284,29 +443,16 @@ class Tools:
         - Automatically uses the correct API info for known CRDs.
         - Falls back to generic behavior for unknown CRDs.
         """
-        crd_info = None
-
-        # If user passed a known CRD name instead of group
-        if group in KNOWN_CRDS:
-            crd_info = KNOWN_CRDS[group]
-        else:
-            # Try to match by group+plural ignoring case
-            for info in KNOWN_CRDS.values():
-                if info["group"].lower() == str(group).lower() and info["plural"].lower() == str(plural).lower():
-                    crd_info = info
-                    break
+        # Friendly name first, then group+plural ignoring case
+        crd_info = KNOWN_CRDS.get(group) or _CRD_BY_GP.get(
+            (str(group).lower(), str(plural or "").lower())
+        )
 
         try:
             if crd_info:  # Known CRD → override args and use summarizer
-                if namespace:
-                    resources = self.custom_api.list_namespaced_custom_object(
-                        group=crd_info["group"], version=crd_info["version"],
-                        namespace=namespace, plural=crd_info["plural"]
-                    )
-                else:
-                    resources = self.custom_api.list_cluster_custom_object(
-                        group=crd_info["group"], version=crd_info["version"], plural=crd_info["plural"]
-                    )
+                resources = self._list_custom_objects(
+                    crd_info["group"], crd_info["version"], crd_info["plural"], namespace
+                )
                 items = resources.get("items", [])
                 summary = crd_info["summarizer"](items)
                 return {"summary": summary, "data": resources}
@@ -315,14 +461,7 @@ class Tools:
             if not all([group, version, plural]):
                 return {"error": "Unknown CRD and missing API details (group/version/plural required)"}
 
-            if namespace:
-                resources = self.custom_api.list_namespaced_custom_object(
-                    group=group, version=version, namespace=namespace, plural=plural
-                )
-            else:
-                resources = self.custom_api.list_cluster_custom_object(
-                    group=group, version=version, plural=plural
-                )
+            resources = self._list_custom_objects(group, version, plural, namespace)
 
             return {"summary": f"Retrieved {len(resources.get('items', []))} {plural} objects.", "data": resources}
 